@@ -15,13 +15,18 @@ Options:
     --font FONT            Font family (default: monospace)
 
 Requirements:
-    pip install Pillow
+    pip install Pillow numpy
+
+    For faster pixel operations, pillow-simd can replace Pillow as a drop-in
+    (uninstall Pillow first): pip install pillow-simd
 
 Example:
     python ansi_to_image.py /tmp/tui_output.txt --output /tmp/screenshot.png
 """
 
 import argparse
+import functools
+import itertools
 import re
 import sys
 from pathlib import Path
@@ -32,6 +37,12 @@ except ImportError:
     print("Error: Pillow is required. Install with: pip install Pillow", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy is required. Install with: pip install numpy", file=sys.stderr)
+    sys.exit(1)
+
 
 # ANSI color codes to RGB
 DARK_THEME = {
@@ -117,6 +128,35 @@ LIGHT_THEME = {
 }
 
 
+def _int_color_tables(theme: dict) -> tuple:
+    """Return (fg, bg) SGR color tables keyed by int code.
+
+    Built-in themes carry precomputed tables; custom themes with only
+    'colors'/'bg_colors' get them built on the fly.
+    """
+    if '_fg_int' in theme and '_bg_int' in theme:
+        return theme['_fg_int'], theme['_bg_int']
+    return (
+        {int(k): v for k, v in theme['colors'].items()},
+        {int(k): v for k, v in theme['bg_colors'].items()},
+    )
+
+
+# Integer-keyed copies of the SGR color tables for iter_ansi_runs dispatch
+for _theme in (DARK_THEME, LIGHT_THEME):
+    _theme['_fg_int'], _theme['_bg_int'] = _int_color_tables(_theme)
+
+
+# Cursor control sequences stripped before parsing
+_CURSOR_RE = re.compile(r'\x1b\[\?[0-9;]*[a-zA-Z]')
+_CSI_CLEAR_RE = re.compile(r'\x1b\[[0-9;]*[HJKfsu]')
+_CURSOR_RE_B = re.compile(rb'\x1b\[\?[0-9;]*[a-zA-Z]')
+_CSI_CLEAR_RE_B = re.compile(rb'\x1b\[[0-9;]*[HJKfsu]')
+
+# Remaining CSI sequences: parameters, then the final byte (empty if truncated)
+_CSI_SEQ_RE = re.compile(r'\x1b\[([^mABCDEFGHJKSTfnsu]*)([mABCDEFGHJKSTfnsu]?)')
+
+
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hex color to RGB tuple."""
     hex_color = hex_color.lstrip('#')
@@ -147,107 +187,139 @@ def parse_256_color(code: int) -> tuple:
         return (gray, gray, gray)
 
 
-def parse_ansi(text: str, theme: dict) -> list:
-    """Parse ANSI text into a list of (char, fg_color, bg_color, bold) tuples."""
+# Precomputed xterm 256-color palette
+_XTERM256 = tuple(parse_256_color(code) for code in range(256))
+
+
+def _sgr_int(param: str):
+    """Convert an SGR parameter to int; empty means 0, invalid means None."""
+    if not param:
+        return 0
+    try:
+        return int(param)
+    except ValueError:
+        return None
+
+
+def _extended_color(codes: list, j: int) -> tuple:
+    """Decode a 38/48 extended color at codes[j] into (color, params consumed)."""
+    mode = codes[j + 1] if j + 1 < len(codes) else None
+    if mode == 5 and j + 2 < len(codes):
+        index = codes[j + 2]
+        if index is not None and 0 <= index < 256:
+            return _XTERM256[index], 2
+    elif mode == 2 and j + 4 < len(codes):
+        rgb = codes[j + 2:j + 5]
+        if None not in rgb:
+            return tuple(min(max(c, 0), 255) for c in rgb), 4
+    return None, 0
+
+
+def _text_runs(chunk: str, fg_color: tuple, bg_color: tuple, bold: bool):
+    """Yield a plain-text chunk as runs, with each newline as its own run."""
+    for n, line in enumerate(chunk.replace('\r', '').split('\n')):
+        if n:
+            yield ('\n', fg_color, bg_color, bold)
+        if line:
+            yield (line, fg_color, bg_color, bold)
+
+
+def iter_ansi_runs(text, theme: dict):
+    """Parse ANSI text into (text, fg_color, bg_color, bold) runs.
+
+    Consecutive characters sharing a style arrive as one run; each newline is
+    yielded as a separate '\n' run. Accepts str or raw UTF-8 bytes; bytes are
+    stripped before the single decode.
+    """
     # Remove cursor control sequences
-    text = re.sub(r'\x1b\[\?[0-9;]*[a-zA-Z]', '', text)
-    text = re.sub(r'\x1b\[[0-9;]*[HJKfsu]', '', text)
+    if isinstance(text, bytes):
+        text = _CURSOR_RE_B.sub(b'', text)
+        text = _CSI_CLEAR_RE_B.sub(b'', text)
+        text = text.decode('utf-8', errors='replace')
+    else:
+        text = _CURSOR_RE.sub('', text)
+        text = _CSI_CLEAR_RE.sub('', text)
 
-    result = []
     fg_color = theme['foreground']
     bg_color = theme['background']
     bold = False
     underline = False
+    fg_colors, bg_colors = _int_color_tables(theme)
+
+    # Fast path: no escape codes left, every char shares the default style
+    if '\x1b' not in text:
+        yield from _text_runs(text, fg_color, bg_color, bold)
+        return
+
+    pos = 0
+    for match in _CSI_SEQ_RE.finditer(text):
+        # Plain text (including any lone ESC) up to the escape sequence
+        if match.start() > pos:
+            yield from _text_runs(text[pos:match.start()], fg_color, bg_color, bold)
+        pos = match.end()
+        if match.group(2) != 'm':
+            continue
+
+        # Apply SGR parameters
+        codes = [_sgr_int(c) for c in match.group(1).split(';')]
+        j = 0
+        while j < len(codes):
+            code = codes[j]
+            if code is None:
+                j += 1
+                continue
+
+            if code == 0:
+                fg_color = theme['foreground']
+                bg_color = theme['background']
+                bold = False
+                underline = False
+            elif code == 1:
+                bold = True
+            elif code == 4:
+                underline = True
+            elif code == 22:
+                bold = False
+            elif code == 24:
+                underline = False
+            elif code == 38:
+                # Extended foreground color
+                color, consumed = _extended_color(codes, j)
+                if color is not None:
+                    fg_color = color
+                    j += consumed
+            elif code == 48:
+                # Extended background color
+                color, consumed = _extended_color(codes, j)
+                if color is not None:
+                    bg_color = color
+                    j += consumed
+            elif code in fg_colors:
+                fg_color = fg_colors[code]
+            elif code in bg_colors:
+                bg_color = bg_colors[code]
+            elif code == 39:
+                fg_color = theme['foreground']
+            elif code == 49:
+                bg_color = theme['background']
+            j += 1
+
+    if pos < len(text):
+        yield from _text_runs(text[pos:], fg_color, bg_color, bold)
+
+
+def parse_ansi(text, theme: dict) -> list:
+    """Parse ANSI text into a list of (char, fg_color, bg_color, bold) tuples."""
+    return [
+        (c, fg, bg, bold)
+        for run, fg, bg, bold in iter_ansi_runs(text, theme)
+        for c in run
+    ]
 
-    i = 0
-    while i < len(text):
-        if text[i] == '\x1b' and i + 1 < len(text) and text[i + 1] == '[':
-            # Parse ANSI escape sequence
-            end = i + 2
-            while end < len(text) and text[end] not in 'mABCDEFGHJKSTfnsu':
-                end += 1
-            if end < len(text) and text[end] == 'm':
-                codes = text[i+2:end].split(';')
-                j = 0
-                while j < len(codes):
-                    try:
-                        code = int(codes[j]) if codes[j] else 0
-                    except ValueError:
-                        j += 1
-                        continue
-
-                    if code == 0:
-                        fg_color = theme['foreground']
-                        bg_color = theme['background']
-                        bold = False
-                        underline = False
-                    elif code == 1:
-                        bold = True
-                    elif code == 4:
-                        underline = True
-                    elif code == 22:
-                        bold = False
-                    elif code == 24:
-                        underline = False
-                    elif code == 38:
-                        # Extended foreground color
-                        if j + 1 < len(codes):
-                            try:
-                                if int(codes[j + 1]) == 5 and j + 2 < len(codes):
-                                    fg_color = parse_256_color(int(codes[j + 2]))
-                                    j += 2
-                                elif int(codes[j + 1]) == 2 and j + 4 < len(codes):
-                                    fg_color = (int(codes[j + 2]), int(codes[j + 3]), int(codes[j + 4]))
-                                    j += 4
-                            except (ValueError, IndexError):
-                                pass
-                    elif code == 48:
-                        # Extended background color
-                        if j + 1 < len(codes):
-                            try:
-                                if int(codes[j + 1]) == 5 and j + 2 < len(codes):
-                                    bg_color = parse_256_color(int(codes[j + 2]))
-                                    j += 2
-                                elif int(codes[j + 1]) == 2 and j + 4 < len(codes):
-                                    bg_color = (int(codes[j + 2]), int(codes[j + 3]), int(codes[j + 4]))
-                                    j += 4
-                            except (ValueError, IndexError):
-                                pass
-                    elif str(code) in theme['colors']:
-                        fg_color = theme['colors'][str(code)]
-                    elif str(code) in theme['bg_colors']:
-                        bg_color = theme['bg_colors'][str(code)]
-                    elif code == 39:
-                        fg_color = theme['foreground']
-                    elif code == 49:
-                        bg_color = theme['background']
-                    j += 1
-                i = end + 1
-            else:
-                i = end + 1
-        elif text[i] == '\n':
-            result.append(('\n', fg_color, bg_color, bold))
-            i += 1
-        elif text[i] == '\r':
-            i += 1
-        else:
-            result.append((text[i], fg_color, bg_color, bold))
-            i += 1
-
-    return result
-
-
-def render_to_image(
-    parsed: list,
-    font_size: int = 14,
-    theme: dict = None,
-    font_path: str = None
-) -> Image:
-    """Render parsed ANSI content to an image."""
-    if theme is None:
-        theme = DARK_THEME
 
-    # Try to load a monospace font
+@functools.lru_cache(maxsize=16)
+def _load_font(font_path: str, font_size: int) -> ImageFont.ImageFont:
+    """Load the requested font, falling back to common monospace fonts."""
     try:
         if font_path:
             font = ImageFont.truetype(font_path, font_size)
@@ -271,12 +343,50 @@ def render_to_image(
     except Exception:
         font = ImageFont.load_default()
 
+    return font
+
+
+@functools.lru_cache(maxsize=4096)
+def _glyph(char: str, font: ImageFont.ImageFont) -> tuple:
+    """Render a glyph once as an (mask, dx, dy) tuple for reuse via paste.
+
+    The mask covers the glyph's full ink box, so overhanging glyphs blend into
+    neighbouring cells exactly as draw.text would. Returns None for blank glyphs.
+    """
+    bbox = font.getbbox(char)
+    if bbox[2] <= bbox[0] or bbox[3] <= bbox[1]:
+        return None
+    dx = min(0, bbox[0])
+    dy = min(0, bbox[1])
+    mask = Image.new('L', (bbox[2] - dx, bbox[3] - dy), 0)
+    ImageDraw.Draw(mask).text((-dx, -dy), char, font=font, fill=255)
+    return mask, dx, dy
+
+
+def render_to_image(
+    parsed,
+    font_size: int = 14,
+    theme: dict = None,
+    font_path: str = None
+) -> Image:
+    """Render parsed ANSI content to an image.
+
+    Accepts any iterable of (text, fg_color, bg_color, bold) items, either the
+    runs from iter_ansi_runs or the per-character tuples from parse_ansi.
+    """
+    if theme is None:
+        theme = DARK_THEME
+
+    font = _load_font(font_path, font_size)
+
     # Calculate character dimensions
     bbox = font.getbbox('M')
     char_width = bbox[2] - bbox[0]
     char_height = int(font_size * 1.2)
+    # Fallback fonts may be proportional; those are measured per run
+    monospace = font.getlength('i') == font.getlength('M')
 
-    # Calculate image dimensions
+    # Split into lines
     lines = []
     current_line = []
     for item in parsed:
@@ -288,34 +398,65 @@ def render_to_image(
     if current_line:
         lines.append(current_line)
 
-    max_width = max(len(line) for line in lines) if lines else 80
-    height = len(lines) if lines else 24
-
-    # Add padding
+    # Lay out runs and non-default background spans, tracking the widest line
     padding = 10
-    img_width = max_width * char_width + padding * 2
-    img_height = height * char_height + padding * 2
-
-    # Create image
-    img = Image.new('RGB', (img_width, img_height), theme['background'])
-    draw = ImageDraw.Draw(img)
-
-    # Render text
+    runs = []
+    spans = []
+    max_x = padding
     y = padding
     for line in lines:
         x = padding
-        for char, fg, bg, bold in line:
-            # Draw background
-            if bg != theme['background']:
-                draw.rectangle(
-                    [x, y, x + char_width, y + char_height],
-                    fill=bg
-                )
-            # Draw character
-            draw.text((x, y), char, font=font, fill=fg)
-            x += char_width
+        # Background spans cover adjacent runs sharing a bg color
+        span_x = x
+        span_bg = theme['background']
+        # Merge consecutive same-style items into one run
+        for (fg, bg, bold), items in itertools.groupby(line, key=lambda t: t[1:]):
+            run_str = ''.join(item[0] for item in items)
+            if bg != span_bg:
+                if span_bg != theme['background']:
+                    spans.append((span_x, x, y, span_bg))
+                span_x = x
+                span_bg = bg
+            runs.append((x, y, run_str, fg))
+            if monospace:
+                x += char_width * len(run_str)
+            else:
+                x += int(font.getlength(run_str))
+        if span_bg != theme['background']:
+            spans.append((span_x, x, y, span_bg))
+        max_x = max(max_x, x)
         y += char_height
 
+    # Image dimensions, defaulting to an empty 80x24 terminal
+    if lines:
+        img_width = max_x + padding
+        img_height = len(lines) * char_height + padding * 2
+    else:
+        img_width = 80 * char_width + padding * 2
+        img_height = 24 * char_height + padding * 2
+
+    # Paint backgrounds into a pixel buffer with array slicing
+    canvas = np.empty((img_height, img_width, 3), dtype=np.uint8)
+    canvas[:] = theme['background']
+    for x0, x1, y, bg in spans:
+        # Inclusive bounds, as draw.rectangle would fill
+        canvas[y:y + char_height + 1, x0:x1 + 1] = bg
+
+    img = Image.fromarray(canvas)
+
+    if monospace:
+        # Draw characters from the glyph cache
+        for x, y, run_str, fg in runs:
+            for i, char in enumerate(run_str):
+                glyph = _glyph(char, font)
+                if glyph is not None:
+                    mask, dx, dy = glyph
+                    img.paste(fg, (x + i * char_width + dx, y + dy), mask)
+    else:
+        draw = ImageDraw.Draw(img)
+        for x, y, run_str, fg in runs:
+            draw.text((x, y), run_str, font=font, fill=fg)
+
     return img
 
 
@@ -340,12 +481,14 @@ def main():
 
     theme = DARK_THEME if args.theme == 'dark' else LIGHT_THEME
 
-    # Read input
-    with open(input_path, 'r') as f:
+    # Read input as bytes; iter_ansi_runs decodes once after stripping
+    with open(input_path, 'rb') as f:
         content = f.read()
+    # Translate newlines as text mode would
+    content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
 
-    # Parse ANSI
-    parsed = parse_ansi(content, theme)
+    # Parse ANSI into style runs, consumed directly by the renderer
+    parsed = iter_ansi_runs(content, theme)
 
     # Render to image
     img = render_to_image(parsed, args.font_size, theme, args.font)
@@ -14,6 +14,8 @@ Options:
     --height HEIGHT        Terminal height (default: 24)
     --output FILE          Output file (default: stdout)
     --timeout SECONDS      Max wait time (default: 5)
+    --key-delay SECONDS    Pause between keys; 0 sends all keys at once (default: 0)
+    --idle-ms MS           Quiet period that ends a read (default: 250)
 
 Example:
     python capture_tui.py ./chronoflow --keys "jj<tab>" --output /tmp/output.txt
@@ -88,12 +90,95 @@ def key_to_bytes(key: str) -> bytes:
         return key.encode('utf-8')
 
 
+def _drain(
+    fd: int,
+    idle_ms: float = 250,
+    max_ms: float = 1500,
+    settle_ms: float = 0,
+    start_ms: float = None
+) -> bytes:
+    """Read everything the application writes to fd until it goes quiet.
+
+    Waits up to start_ms (default: idle_ms) for output to start, then keeps
+    reading in 64 KiB chunks until no data arrives for idle_ms, stopping at
+    max_ms overall. Quiet gaps inside the first settle_ms do not end the
+    drain, so slow start-up renders are kept.
+    """
+    chunks = []
+    start = time.monotonic()
+    deadline = start + max_ms / 1000
+    settle_until = start + settle_ms / 1000
+    start_until = start + (idle_ms if start_ms is None else start_ms) / 1000
+    while True:
+        now = time.monotonic()
+        remaining = deadline - now
+        if remaining <= 0:
+            break
+        if chunks:
+            wait = min(max(idle_ms / 1000, settle_until - now), remaining)
+        else:
+            wait = min(max(start_until - now, settle_until - now), remaining)
+        if wait <= 0:
+            break
+        ready, _, _ = select.select([fd], [], [], wait)
+        if not ready:
+            break
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            continue
+        except OSError:
+            break
+        if not data:
+            break
+        chunks.append(data)
+    return b''.join(chunks)
+
+
+def _write_all(fd: int, data: bytes, stall_timeout: float) -> tuple[bytes, int]:
+    """Write all of data to the non-blocking fd, waiting while the pty is full.
+
+    Output that arrives while waiting is read so the application can keep
+    draining its input. Gives up only if the pty accepts nothing for
+    stall_timeout seconds or the application has exited.
+
+    Returns:
+        A tuple of (output read while writing, number of bytes written)
+    """
+    output = []
+    written = 0
+    view = memoryview(data)
+    while written < len(data):
+        readable, writable, _ = select.select([fd], [fd], [], stall_timeout)
+        if not readable and not writable:
+            break
+        if readable:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                chunk = None
+            except OSError:
+                break
+            if chunk:
+                output.append(chunk)
+        if writable:
+            try:
+                written += os.write(fd, view[written:])
+            except BlockingIOError:
+                continue
+            except OSError:
+                break
+    return b''.join(output), written
+
+
 def capture_tui(
     app_path: str,
     keys: str = "",
     width: int = 80,
     height: int = 24,
-    timeout: float = 5.0
+    timeout: float = 5.0,
+    key_delay: float = 0.0,
+    idle_ms: float = 250
 ) -> str:
     """Capture TUI output from an application.
 
@@ -103,6 +188,8 @@ def capture_tui(
         width: Terminal width
         height: Terminal height
         timeout: Maximum time to wait for output
+        key_delay: Seconds to pause between keys; 0 writes them in one batch
+        idle_ms: Milliseconds without output after which a read is complete
 
     Returns:
         The captured terminal output including ANSI escape codes
@@ -136,71 +223,62 @@ def capture_tui(
 
     os.close(slave_fd)
 
+    # Non-blocking reads so a drain never stalls on an empty pty
+    flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
+    fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
     output = b''
-    start_time = time.time()
+    deadline = time.monotonic() + timeout
+
+    def drain(max_ms: float = 1500, **kwargs) -> bytes:
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        if remaining_ms <= 0:
+            return b''
+        return _drain(
+            master_fd,
+            idle_ms=idle_ms,
+            max_ms=min(remaining_ms, max_ms),
+            **kwargs
+        )
 
     try:
-        # Wait for initial render
-        time.sleep(0.5)
-
-        # Read initial output
-        while True:
-            ready, _, _ = select.select([master_fd], [], [], 0.1)
-            if ready:
-                try:
-                    data = os.read(master_fd, 4096)
-                    if data:
-                        output += data
-                    else:
-                        break
-                except OSError:
-                    break
-            else:
-                break
+        # Read initial render, giving the app time to finish start-up I/O and
+        # switch the terminal to raw mode before any keys are sent
+        output += drain(settle_ms=500, start_ms=1500)
 
-        # Send keys if specified
+        # Send keys if specified; key writes are not cut off by the timeout
         if keys:
             parsed_keys = parse_keys(keys)
-            for key in parsed_keys:
-                key_bytes = key_to_bytes(key)
-                os.write(master_fd, key_bytes)
-                time.sleep(0.1)
-
-            # Wait for response
-            time.sleep(0.5)
-
-            # Read output after keys
-            while True:
-                ready, _, _ = select.select([master_fd], [], [], 0.1)
-                if ready:
-                    try:
-                        data = os.read(master_fd, 4096)
-                        if data:
-                            output += data
-                        else:
-                            break
-                    except OSError:
+            key_bytes = [key_to_bytes(k) for k in parsed_keys]
+            sent = 0
+            if key_delay > 0:
+                # Paced: one key at a time, as the app may need between keys
+                for data in key_bytes:
+                    read, written = _write_all(master_fd, data, timeout)
+                    output += read
+                    if written < len(data):
                         break
-                else:
-                    break
-
-        # Final wait and read
-        remaining = timeout - (time.time() - start_time)
-        if remaining > 0:
-            time.sleep(min(remaining, 0.5))
-            while True:
-                ready, _, _ = select.select([master_fd], [], [], 0.1)
-                if ready:
-                    try:
-                        data = os.read(master_fd, 4096)
-                        if data:
-                            output += data
-                        else:
-                            break
-                    except OSError:
+                    sent += 1
+                    time.sleep(key_delay)
+            else:
+                read, written = _write_all(master_fd, b''.join(key_bytes), timeout)
+                output += read
+                for data in key_bytes:
+                    if written < len(data):
                         break
-                else:
-                    break
+                    written -= len(data)
+                    sent += 1
+            if sent < len(parsed_keys):
+                print(
+                    f"Warning: {len(parsed_keys) - sent} of {len(parsed_keys)} keys were not sent",
+                    file=sys.stderr
+                )
+
+            # Read the re-render after the last key
+            output += _drain(master_fd, idle_ms=idle_ms)
+
+        # Final read to pick up any late re-render within the timeout
+        output += drain(max_ms=500)
 
     finally:
         # Clean up
@@ -224,6 +302,15 @@ def main():
     parser.add_argument('--height', type=int, default=24, help='Terminal height')
     parser.add_argument('--output', help='Output file (default: stdout)')
     parser.add_argument('--timeout', type=float, default=5.0, help='Timeout in seconds')
+    parser.add_argument(
+        '--key-delay', type=float, default=0.0,
+        help='Seconds between keys (default: 0, send all at once); '
+             'use a delay when <esc> is followed by other keys'
+    )
+    parser.add_argument(
+        '--idle-ms', type=float, default=250,
+        help='Milliseconds without output that end a read (default: 250)'
+    )
 
     args = parser.parse_args()
 
@@ -236,7 +323,9 @@ def main():
         keys=args.keys,
         width=args.width,
         height=args.height,
-        timeout=args.timeout
+        timeout=args.timeout,
+        key_delay=args.key_delay,
+        idle_ms=args.idle_ms
     )
 
     if args.output:
@@ -10,18 +10,24 @@ Usage:
 
 Options:
     --threshold PERCENT    Acceptable difference percentage (default: 0.1)
+    --pixel-tolerance N    Ignore per-pixel intensity differences up to N (default: 0)
     --output FILE          Save diff image to file
     --fail-on-diff         Exit with code 1 if different
     --verbose              Show detailed comparison info
 
 Requirements:
-    pip install Pillow
+    pip install Pillow numpy
+
+    For faster pixel operations, pillow-simd can replace Pillow as a drop-in
+    (uninstall Pillow first): pip install pillow-simd
 
 Example:
     python compare_screenshots.py golden/main_view.png /tmp/screenshot.png --fail-on-diff
 """
 
 import argparse
+import functools
+import os
 import sys
 from pathlib import Path
 
@@ -31,10 +37,26 @@ except ImportError:
     print("Error: Pillow is required. Install with: pip install Pillow", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy is required. Install with: pip install numpy", file=sys.stderr)
+    sys.exit(1)
+
 
-def calculate_difference(img1: Image, img2: Image) -> tuple[float, Image]:
+def calculate_difference(
+    img1: Image,
+    img2: Image,
+    tolerance: int = 0
+) -> tuple[float, Image]:
     """Calculate the difference between two images.
 
+    Args:
+        img1: First image
+        img2: Second image
+        tolerance: Grayscale difference (0-255) at or below which a pixel
+            still counts as equal
+
     Returns:
         A tuple of (difference_percentage, diff_image)
     """
@@ -42,21 +64,15 @@ def calculate_difference(img1: Image, img2: Image) -> tuple[float, Image]:
     if img1.mode != img2.mode:
         img2 = img2.convert(img1.mode)
 
-    # Handle size differences
+    # Handle size differences: compare the overlapping region only, and count
+    # every pixel outside it as different
+    total_pixels = max(img1.width, img2.width) * max(img1.height, img2.height)
     if img1.size != img2.size:
-        # Create a new image with the larger dimensions
-        max_width = max(img1.width, img2.width)
-        max_height = max(img1.height, img2.height)
-
-        # Expand both images to the same size
-        new_img1 = Image.new(img1.mode, (max_width, max_height), (0, 0, 0))
-        new_img2 = Image.new(img2.mode, (max_width, max_height), (0, 0, 0))
-
-        new_img1.paste(img1, (0, 0))
-        new_img2.paste(img2, (0, 0))
-
-        img1 = new_img1
-        img2 = new_img2
+        min_width = min(img1.width, img2.width)
+        min_height = min(img1.height, img2.height)
+        img1 = img1.crop((0, 0, min_width, min_height))
+        img2 = img2.crop((0, 0, min_width, min_height))
+    different_pixels = total_pixels - img1.width * img1.height
 
     # Calculate pixel difference
     diff = ImageChops.difference(img1, img2)
@@ -64,9 +80,14 @@ def calculate_difference(img1: Image, img2: Image) -> tuple[float, Image]:
     # Convert to grayscale for analysis
     diff_gray = diff.convert('L')
 
-    # Count different pixels
-    total_pixels = img1.width * img1.height
-    different_pixels = sum(1 for pixel in diff_gray.getdata() if pixel > 0)
+    # Threshold through a 256-entry lookup table applied in C
+    if tolerance > 0:
+        diff_gray = diff_gray.point([0] * (tolerance + 1) + [255] * (255 - tolerance))
+
+    # Count different pixels; getbbox() scans in C and returns None when the
+    # overlap is identical
+    if diff_gray.getbbox() is not None:
+        different_pixels += int(np.count_nonzero(np.asarray(diff_gray)))
 
     difference_percent = (different_pixels / total_pixels) * 100
 
@@ -110,38 +131,37 @@ def create_diff_visualization(
     # Actual
     viz.paste(actual, (padding * 2 + max_width, y))
 
-    # Diff (enhance visibility)
-    diff_enhanced = diff.copy()
-    # Make differences more visible by increasing contrast
-    diff_data = list(diff_enhanced.getdata())
-    enhanced_data = []
-    for pixel in diff_data:
-        if isinstance(pixel, tuple):
-            # If any channel is different, highlight in red
-            if any(c > 0 for c in pixel):
-                enhanced_data.append((255, 0, 0))
-            else:
-                enhanced_data.append(pixel)
-        else:
-            enhanced_data.append((255, 0, 0) if pixel > 0 else (0, 0, 0))
-
-    if diff_enhanced.mode != 'RGB':
-        diff_enhanced = diff_enhanced.convert('RGB')
-
-    diff_highlight = Image.new('RGB', diff.size)
-    diff_highlight.putdata(enhanced_data)
+    # Diff (enhance visibility): highlight any differing pixel in red
+    diff_data = np.asarray(diff)
+    mask = diff_data.any(axis=2) if diff_data.ndim == 3 else diff_data > 0
+    enhanced_data = np.zeros(mask.shape + (3,), dtype=np.uint8)
+    enhanced_data[mask] = (255, 0, 0)
+    diff_highlight = Image.fromarray(enhanced_data)
 
     viz.paste(diff_highlight, (padding * 3 + max_width * 2, y))
 
     return viz
 
 
+@functools.lru_cache(maxsize=64)
+def _load_golden(path: str, mtime_ns: int, size: int) -> Image:
+    """Decode a golden image once per (path, mtime, size).
+
+    Goldens are reused across many comparisons in one run; the stat fields in
+    the key invalidate the entry when the file changes.
+    """
+    img = Image.open(path)
+    img.load()
+    return img
+
+
 def compare_screenshots(
     golden_path: str,
     actual_path: str,
     threshold: float = 0.1,
     output_path: str = None,
-    verbose: bool = False
+    verbose: bool = False,
+    pixel_tolerance: int = 0
 ) -> tuple[bool, float]:
     """Compare two screenshots.
 
@@ -151,12 +171,14 @@ def compare_screenshots(
         threshold: Acceptable difference percentage
         output_path: Optional path to save diff image
         verbose: Print detailed information
+        pixel_tolerance: Per-pixel grayscale difference to ignore (0-255)
 
     Returns:
         A tuple of (is_same, difference_percentage)
     """
     # Load images
-    golden = Image.open(golden_path)
+    stat = os.stat(golden_path)
+    golden = _load_golden(golden_path, stat.st_mtime_ns, stat.st_size)
     actual = Image.open(actual_path)
 
     if verbose:
@@ -171,7 +193,7 @@ def compare_screenshots(
         print(f"  Actual: {actual.size}")
 
     # Calculate difference
-    diff_percent, diff_img = calculate_difference(golden, actual)
+    diff_percent, diff_img = calculate_difference(golden, actual, pixel_tolerance)
 
     if verbose:
         print(f"Difference: {diff_percent:.4f}%")
@@ -200,6 +222,10 @@ def main():
         '--threshold', type=float, default=0.1,
         help='Acceptable difference percentage (default: 0.1)'
     )
+    parser.add_argument(
+        '--pixel-tolerance', type=int, default=0,
+        help='Ignore per-pixel intensity differences up to this value, 0-255 (default: 0)'
+    )
     parser.add_argument('--output', help='Save diff image to file')
     parser.add_argument(
         '--fail-on-diff', action='store_true',
@@ -221,13 +247,18 @@ def main():
         print(f"Error: Actual file not found: {args.actual}", file=sys.stderr)
         sys.exit(1)
 
+    if not 0 <= args.pixel_tolerance <= 255:
+        print(f"Error: Pixel tolerance must be between 0 and 255: {args.pixel_tolerance}", file=sys.stderr)
+        sys.exit(1)
+
     # Compare
     is_same, diff_percent = compare_screenshots(
         str(golden_path),
         str(actual_path),
         threshold=args.threshold,
         output_path=args.output,
-        verbose=args.verbose
+        verbose=args.verbose,
+        pixel_tolerance=args.pixel_tolerance
     )
 
     # Output result